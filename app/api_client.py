@@ -1,16 +1,34 @@
-import requests
 from typing import Dict, Any, Optional
 import json
 from datetime import datetime
 import httpx
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+from . import json_utils
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry network errors and 5xx responses, not client errors"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
 
 class XBetApiClient:
     def __init__(self, base_url: str = "https://1xbetbd.com"):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Shared client so connections are kept alive across fetches
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            },
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=200,
+                keepalive_expiry=30.0
+            ),
+            timeout=10.0
+        )
     
     # async def fetch_matches(
     #     self,
@@ -56,7 +74,6 @@ class XBetApiClient:
         get_empty: bool = True,
         gr: int = 925
     ):
-        url = f"{self.base_url}/LineFeed/Get1x2_VZip"
         params = {
             "sports": sports,
             "count": count,
@@ -69,10 +86,17 @@ class XBetApiClient:
             "gr": gr
         }
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(3),
+                wait=wait_exponential(multiplier=0.2, max=2),
+                retry=retry_if_exception(_is_retryable),
+                reraise=True
+            ):
+                with attempt:
+                    response = await self._client.get("/LineFeed/Get1x2_VZip", params=params)
+                    response.raise_for_status()
+            return json_utils.loads(response.content)
+        except httpx.HTTPError as e:
             print(f"Error fetching data: {e}")
             return None
         except json.JSONDecodeError as e:
@@ -85,7 +109,11 @@ class XBetApiClient:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"data/api_response_{timestamp}.json"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(json_utils.dumps(data, indent=True))
         
-        return filename
\ No newline at end of file
+        return filename
+    
+    async def close(self):
+        """Close the underlying HTTP client"""
+        await self._client.aclose()
@@ -0,0 +1,24 @@
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback when orjson is not installed
+    orjson = None
+    import json
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Encode data to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(
+        data,
+        indent=2 if indent else None,
+        ensure_ascii=False,
+        default=str
+    ).encode("utf-8")
@@ -1,24 +1,37 @@
 from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from typing import List, Optional, Dict, Any
-import json
+from typing import List, Optional, Dict, Any, Callable
+from cachetools import TTLCache
+import asyncio
 import pandas as pd
 from datetime import datetime
 import os
 
 from .parser import BettingDataParser
 from .api_client import XBetApiClient
+from . import json_utils
 from .models import Match, ParsedResponse
 
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (stdlib json fallback)"""
+    
+    def render(self, content: Any) -> bytes:
+        return json_utils.dumps(content)
+
 # Create FastAPI app
 app = FastAPI(
     title="1xbet Data Parser API",
     description="Parse and analyze 1xbet betting data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
+# Match lists and exports compress well (repeated names, numeric odds)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Setup templates
 templates = Jinja2Templates(directory="app/templates")
 
@@ -26,19 +39,49 @@ templates = Jinja2Templates(directory="app/templates")
 current_parser: Optional[BettingDataParser] = None
 api_client = XBetApiClient()
 
+# Serialized responses keyed by (endpoint, query params), cleared on fetch
+response_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+
+def cached_json(key: tuple, build: Callable[[], Any]) -> Response:
+    """Return cached JSON bytes for key, building and caching on a miss"""
+    body = response_cache.get(key)
+    if body is None:
+        body = json_utils.dumps(build())
+        response_cache[key] = body
+    return Response(content=body, media_type="application/json")
+
+def merge_responses(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine several API responses into one, concatenating their matches"""
+    return {
+        **responses[0],
+        "Value": [match for response in responses for match in response.get("Value", [])]
+    }
+
+def attachment_response(body: bytes, media_type: str, filename: str) -> Response:
+    """Send an in-memory export as a file download"""
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # Load sample data on startup
 @app.on_event("startup")
 async def startup_event():
     global current_parser
     try:
         # Try to load sample data
-        with open("data/sample_data.json", "r", encoding="utf-8") as f:
-            sample_data = json.load(f)
+        with open("data/sample_data.json", "rb") as f:
+            sample_data = json_utils.loads(f.read())
         current_parser = BettingDataParser(sample_data)
         print(f"Loaded {len(current_parser.matches)} matches from sample data")
     except FileNotFoundError:
         print("No sample data found. Use /fetch-live to get live data.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await api_client.close()
+
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Web dashboard"""
@@ -54,15 +97,15 @@ async def get_summary():
     if not current_parser:
         raise HTTPException(status_code=404, detail="No data available")
     
-    return {
+    return cached_json(("summary",), lambda: {
         "total_matches": len(current_parser.matches),
         "football_matches": len(current_parser.get_football_matches()),
         "cricket_matches": len(current_parser.get_cricket_matches()),
         "live_matches": len(current_parser.get_live_matches()),
         "popular_leagues": current_parser.get_popular_leagues()
-    }
+    })
 
-@app.get("/api/matches", response_model=List[Match])
+@app.get("/api/matches", responses={200: {"model": List[Match]}})
 async def get_matches(
     sport: Optional[str] = Query(None, description="Filter by sport (football/cricket)"),
     live_only: bool = Query(False, description="Show only live matches"),
@@ -73,34 +116,25 @@ async def get_matches(
     if not current_parser:
         raise HTTPException(status_code=404, detail="No data available")
     
-    matches = current_parser.matches
+    def build():
+        matches = current_parser.filter_matches(
+            sport=sport, live_only=live_only, min_odds=min_odds, limit=limit
+        )
+        return [m.model_dump(mode="json", by_alias=True) for m in matches]
     
-    # Apply filters
-    if sport:
-        matches = [m for m in matches if m.sport.lower() == sport.lower()]
-    
-    if live_only:
-        matches = [m for m in matches if m.is_live]
-    
-    if min_odds:
-        matches = [
-            m for m in matches 
-            if any(market.odds >= min_odds for market in m.markets.match_result)
-        ]
-    
-    return matches[:limit]
+    return cached_json(("matches", sport, live_only, min_odds, limit), build)
 
-@app.get("/api/match/{match_id}")
+@app.get("/api/match/{match_id}", responses={200: {"model": Match}})
 async def get_match(match_id: int):
     """Get specific match by ID"""
     if not current_parser:
         raise HTTPException(status_code=404, detail="No data available")
     
-    match = next((m for m in current_parser.matches if m.id == match_id), None)
+    match = current_parser.get_match_by_id(match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
-    return match
+    return FastJSONResponse(content=match.model_dump(mode="json", by_alias=True))
 
 @app.get("/api/leagues")
 async def get_leagues():
@@ -108,26 +142,42 @@ async def get_leagues():
     if not current_parser:
         raise HTTPException(status_code=404, detail="No data available")
     
-    return current_parser.get_popular_leagues()
+    return cached_json(("leagues",), current_parser.get_popular_leagues)
 
 @app.post("/api/fetch-live")
 async def fetch_live_data(
-    count: int = Query(100, description="Number of matches to fetch"),
-    sports: int = Query(66, description="Sport ID to fetch (e.g., 1 for football, 66 for cricket)")
+    count: int = Query(100, description="Number of matches to fetch per sport"),
+    sports: List[int] = Query([1, 66], description="Sport IDs to fetch (e.g., 1 for football, 66 for cricket); repeat for several")
 ):
     """Fetch live data from 1xbet API"""
     global current_parser
     
     try:
-        data = await api_client.fetch_matches(count=count, sports=sports)
-        if not data:
+        # Fetch all requested sports concurrently over the shared client
+        sport_ids = list(dict.fromkeys(sports))
+        results = await asyncio.gather(
+            *(api_client.fetch_matches(count=count, sports=sport_id) for sport_id in sport_ids),
+            return_exceptions=True
+        )
+        
+        responses = []
+        for sport_id, result in zip(sport_ids, results):
+            if isinstance(result, Exception):
+                print(f"Error fetching sport {sport_id}: {result}")
+            elif result:
+                responses.append(result)
+        
+        if not responses:
             raise HTTPException(status_code=503, detail="Failed to fetch live data")
         
+        data = merge_responses(responses)
+        
         # Save the response
-        filename = api_client.save_response(data)
+        filename = await asyncio.to_thread(api_client.save_response, data)
         
-        # Parse the data
-        current_parser = BettingDataParser(data)
+        # Parse the data (CPU-bound, keep it off the event loop)
+        current_parser = await asyncio.to_thread(BettingDataParser, data)
+        response_cache.clear()
         
         return {
             "success": True,
@@ -136,44 +186,48 @@ async def fetch_live_data(
             "timestamp": datetime.now().isoformat()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching data: {str(e)}")
 
+CSV_COLUMNS = [
+    "Match", "Sport", "League", "Country", "Start Time", "Home Team", "Away Team",
+    "Home Win Odds", "Draw Odds", "Away Win Odds", "Venue", "Is Live"
+]
+
+def render_csv(parser: BettingDataParser) -> bytes:
+    """Render parsed matches as CSV bytes"""
+    # Build row tuples and let pandas assemble columns in one go
+    records = []
+    for row in parser.rows:
+        match = row.match
+        records.append((
+            match.name,
+            match.sport,
+            match.league,
+            match.country,
+            match.start_time.isoformat(),
+            match.home_team.name,
+            match.away_team.name,
+            row.home_odds,
+            row.draw_odds,
+            row.away_odds,
+            match.venue,
+            match.is_live
+        ))
+    
+    df = pd.DataFrame.from_records(records, columns=CSV_COLUMNS)
+    return df.to_csv(index=False).encode("utf-8")
+
 @app.get("/api/export/csv")
 async def export_csv():
     """Export matches to CSV"""
     if not current_parser:
         raise HTTPException(status_code=404, detail="No data available")
     
-    # Convert to DataFrame
-    matches_data = []
-    for match in current_parser.matches:
-        # Get 1X2 odds
-        home_odds = next((m.odds for m in match.markets.match_result if m.outcome == 1), None)
-        draw_odds = next((m.odds for m in match.markets.match_result if m.outcome == 2), None)
-        away_odds = next((m.odds for m in match.markets.match_result if m.outcome == 3), None)
-        
-        matches_data.append({
-            "Match": match.name,
-            "Sport": match.sport,
-            "League": match.league,
-            "Country": match.country,
-            "Start Time": match.start_time.isoformat(),
-            "Home Team": match.home_team.name,
-            "Away Team": match.away_team.name,
-            "Home Win Odds": home_odds,
-            "Draw Odds": draw_odds,
-            "Away Win Odds": away_odds,
-            "Venue": match.venue,
-            "Is Live": match.is_live
-        })
-    
-    df = pd.DataFrame(matches_data)
-    filename = f"data/matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    df.to_csv(filename, index=False)
-    
-    return FileResponse(
-        filename,
+    return attachment_response(
+        await asyncio.to_thread(render_csv, current_parser),
         media_type="text/csv",
         filename=f"matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     )
@@ -184,13 +238,8 @@ async def export_json():
     if not current_parser:
         raise HTTPException(status_code=404, detail="No data available")
     
-    filename = f"data/matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    
-    with open(filename, 'w') as f:
-        json.dump(current_parser.to_dict(), f, indent=2, default=str)
-    
-    return FileResponse(
-        filename,
+    return attachment_response(
+        await asyncio.to_thread(current_parser.to_json),
         media_type="application/json",
         filename=f"matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     )
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -26,6 +27,10 @@ class Markets(BaseModel):
     handicap: List[Market] = Field(default_factory=list, description="Asian handicap")
     both_teams_score: List[Market] = Field(default_factory=list, description="BTTS")
     correct_score: List[Market] = Field(default_factory=list, description="Correct score")
+    
+    def match_result_odds(self) -> Dict[int, float]:
+        """Map 1X2 outcome (1=home, 2=draw, 3=away) to its first listed odds"""
+        return {m.outcome: m.odds for m in reversed(self.match_result)}
 
 class Weather(BaseModel):
     temperature: Optional[str] = None
@@ -57,6 +62,20 @@ class Match(BaseModel):
     is_live: bool = False
     event_count: int = 0
 
+@dataclass(slots=True, frozen=True)
+class MatchRow:
+    """Flat per-match fields used for filtering and export"""
+    id: int
+    sport: str
+    sport_key: str  # lowercased, interned
+    league: str
+    is_live: bool
+    home_odds: Optional[float]
+    draw_odds: Optional[float]
+    away_odds: Optional[float]
+    max_odds: Optional[float]  # highest odds over all 1X2 markets, None without one
+    match: Match
+
 class ApiResponse(BaseModel):
     error: str = Field(alias="Error")
     error_code: int = Field(alias="ErrorCode")
@@ -1,198 +1,302 @@
 import json
+import sys
+from collections import Counter, defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
-from .models import Match, Team, Market, Markets, Weather, WinProbabilities, ApiResponse
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter
+from . import json_utils
+from .models import Match, MatchRow, Team, Market, Markets, Weather, WinProbabilities, ApiResponse
 
-class BettingDataParser:
-    def __init__(self, api_response: Dict[str, Any]):
-        self.raw_data = api_response
-        self.matches = self._parse_matches()
+# Market type -> Markets list it belongs to
+MARKET_CATEGORIES = {
+    1: "match_result",       # 1X2
+    15: "over_under",        # Over/Under
+    62: "over_under",
+    2: "handicap",           # Handicap
+    17: "handicap",
+    19: "both_teams_score",  # Both teams to score
+    8: "correct_score",      # Correct score
+}
+
+# Weather info key (K) -> Weather field
+WEATHER_FIELDS = {
+    9: "temperature",
+    21: "condition",
+    27: "humidity",
+    23: "wind_speed",
+    25: "pressure",
+    35: "precipitation",
+}
+
+# Serializes the whole match list in one call instead of model_dump() per match
+MATCH_LIST_ADAPTER = TypeAdapter(List[Match])
+
+# Many matches share a kickoff time, so convert each timestamp once.
+# Kept as local time to match datetime.fromtimestamp().
+@lru_cache(maxsize=4096)
+def _start_time(timestamp: int) -> datetime:
+    return datetime.fromtimestamp(timestamp)
+
+def _parse_chunk(values: List[Dict[str, Any]]) -> List[Match]:
+    """Parse a list of raw matches, skipping ones that fail"""
+    matches = []
     
-    def _parse_matches(self) -> List[Match]:
-        """Parse raw API response into structured matches"""
-        matches = []
-        
-        for match_data in self.raw_data.get("Value", []):
-            try:
-                parsed_match = self._parse_single_match(match_data)
-                matches.append(parsed_match)
-            except Exception as e:
-                print(f"Error parsing match {match_data.get('I', 'unknown')}: {e}")
-                continue
-        
-        return matches
+    for match_data in values:
+        try:
+            parsed_match = _parse_single_match(match_data)
+            matches.append(parsed_match)
+        except Exception as e:
+            print(f"Error parsing match {match_data.get('I', 'unknown')}: {e}")
+            continue
     
-    def _parse_single_match(self, match_data: Dict[str, Any]) -> Match:
-        """Parse a single match from raw data"""
-        
-        # Basic match info
-        match_id = match_data.get("I")
-        name = match_data.get("L", "")
-        sport = match_data.get("SE", "")
-        league = match_data.get("LE", "")
-        country = match_data.get("CN", "")
-        start_timestamp = match_data.get("S", 0)
-        start_time = datetime.fromtimestamp(start_timestamp) if start_timestamp else datetime.now()
-        
-        # Teams
-        home_team = Team(
-            name=match_data.get("O1", ""),
-            id=match_data.get("O1I", 0),
-            image=match_data.get("O1IMG", [None])[0] if match_data.get("O1IMG") else None,
-            country=match_data.get("O1C")
-        )
-        
-        away_team = Team(
-            name=match_data.get("O2", ""),
-            id=match_data.get("O2I", 0),
-            image=match_data.get("O2IMG", [None])[0] if match_data.get("O2IMG") else None,
-            country=match_data.get("O2C")
-        )
-        
-        # Venue and stage
-        venue_info = match_data.get("MIO", {})
-        venue = venue_info.get("Loc") if venue_info else None
-        stage = venue_info.get("TSt") if venue_info else None
-        
-        # Win probabilities
-        wp_data = match_data.get("WP", {})
-        probabilities = WinProbabilities(
-            home_win=wp_data.get("P1"),
-            draw=wp_data.get("PX"),
-            away_win=wp_data.get("P2")
-        ) if wp_data else None
-        
-        # Markets
-        markets = self._parse_markets(
-            match_data.get("E", []),
-            match_data.get("AE", [])
+    return matches
+
+def _parse_single_match(match_data: Dict[str, Any]) -> Match:
+    """Parse a single match from raw data"""
+    
+    # Basic match info
+    match_id = match_data.get("I")
+    name = match_data.get("L", "")
+    # Interned: only a handful of distinct values repeat across matches
+    sport = sys.intern(match_data.get("SE", ""))
+    league = sys.intern(match_data.get("LE", ""))
+    country = sys.intern(match_data.get("CN", ""))
+    start_timestamp = match_data.get("S", 0)
+    start_time = _start_time(start_timestamp) if start_timestamp else datetime.now()
+    
+    # Teams
+    home_team = Team(
+        name=match_data.get("O1", ""),
+        id=match_data.get("O1I", 0),
+        image=match_data.get("O1IMG", [None])[0] if match_data.get("O1IMG") else None,
+        country=match_data.get("O1C")
+    )
+    
+    away_team = Team(
+        name=match_data.get("O2", ""),
+        id=match_data.get("O2I", 0),
+        image=match_data.get("O2IMG", [None])[0] if match_data.get("O2IMG") else None,
+        country=match_data.get("O2C")
+    )
+    
+    # Venue and stage
+    venue_info = match_data.get("MIO", {})
+    venue = venue_info.get("Loc") if venue_info else None
+    stage = venue_info.get("TSt") if venue_info else None
+    
+    # Win probabilities
+    wp_data = match_data.get("WP", {})
+    # Passed by alias: the fields only accept P1/PX/P2 on input
+    probabilities = WinProbabilities(
+        P1=wp_data.get("P1"),
+        PX=wp_data.get("PX"),
+        P2=wp_data.get("P2")
+    ) if wp_data else None
+    
+    # Markets
+    markets = _parse_markets(
+        match_data.get("E", []),
+        match_data.get("AE", [])
+    )
+    
+    # Weather
+    weather = _parse_weather(match_data.get("MIS", []))
+    
+    # Status
+    is_live = match_data.get("SS", 0) == 1
+    event_count = match_data.get("EC", 0)
+    
+    return Match(
+        id=match_id,
+        name=name,
+        sport=sport,
+        league=league,
+        country=country,
+        start_time=start_time,
+        home_team=home_team,
+        away_team=away_team,
+        venue=venue,
+        stage=stage,
+        probabilities=probabilities,
+        markets=markets,
+        weather=weather,
+        is_live=is_live,
+        event_count=event_count
+    )
+
+def _parse_markets(main_markets: List[Dict], additional_markets: List[Dict]) -> Markets:
+    """Parse betting markets"""
+    markets = Markets()
+    
+    # Parse main markets
+    for market_data in main_markets:
+        market = Market(
+            type=market_data.get("G", 0),
+            outcome=market_data.get("T", 0),
+            odds=market_data.get("C", 0.0),
+            parameter=market_data.get("P"),
+            is_main=market_data.get("CE") == 1
         )
         
-        # Weather
-        weather = self._parse_weather(match_data.get("MIS", []))
-        
-        # Status
-        is_live = match_data.get("SS", 0) == 1
-        event_count = match_data.get("EC", 0)
-        
-        return Match(
-            id=match_id,
-            name=name,
-            sport=sport,
-            league=league,
-            country=country,
-            start_time=start_time,
-            home_team=home_team,
-            away_team=away_team,
-            venue=venue,
-            stage=stage,
-            probabilities=probabilities,
-            markets=markets,
-            weather=weather,
-            is_live=is_live,
-            event_count=event_count
-        )
+        # Categorize market
+        _categorize_market(market, markets)
     
-    def _parse_markets(self, main_markets: List[Dict], additional_markets: List[Dict]) -> Markets:
-        """Parse betting markets"""
-        markets = Markets()
-        
-        # Parse main markets
-        for market_data in main_markets:
+    # Parse additional markets
+    for market_group in additional_markets:
+        for market_data in market_group.get("ME", []):
             market = Market(
-                type=market_data.get("G", 0),
+                type=market_group.get("G", 0),
                 outcome=market_data.get("T", 0),
                 odds=market_data.get("C", 0.0),
                 parameter=market_data.get("P"),
-                is_main=market_data.get("CE") == 1
+                is_main=False
             )
-            
-            # Categorize market
-            self._categorize_market(market, markets)
-        
-        # Parse additional markets
-        for market_group in additional_markets:
-            for market_data in market_group.get("ME", []):
-                market = Market(
-                    type=market_group.get("G", 0),
-                    outcome=market_data.get("T", 0),
-                    odds=market_data.get("C", 0.0),
-                    parameter=market_data.get("P"),
-                    is_main=False
-                )
-                self._categorize_market(market, markets)
-        
-        return markets
+            _categorize_market(market, markets)
+    
+    return markets
+
+def _categorize_market(market: Market, markets: Markets):
+    """Categorize market into appropriate list"""
+    category = MARKET_CATEGORIES.get(market.type)
+    if category:
+        getattr(markets, category).append(market)
+
+def _parse_weather(weather_data: List[Dict]) -> Optional[Weather]:
+    """Parse weather information"""
+    if not weather_data:
+        return None
+    
+    weather_map = {}
+    for item in weather_data:
+        field = WEATHER_FIELDS.get(item.get("K"))
+        if field:
+            weather_map[field] = item.get("V")
+    
+    return Weather(**weather_map) if weather_map else None
+
+def _build_row(match: Match) -> MatchRow:
+    """Flatten the fields the filters and exports read"""
+    odds = match.markets.match_result_odds()
+    return MatchRow(
+        id=match.id,
+        sport=match.sport,
+        sport_key=sys.intern(match.sport.lower()),
+        league=match.league,
+        is_live=match.is_live,
+        home_odds=odds.get(1),
+        draw_odds=odds.get(2),
+        away_odds=odds.get(3),
+        max_odds=max((market.odds for market in match.markets.match_result), default=None),
+        match=match
+    )
+
+class BettingDataParser:
+    def __init__(self, api_response: Dict[str, Any]):
+        self.raw_data = api_response
+        self.matches = self._parse_matches()
+        self._build_indexes()
+        self._json_export: Optional[bytes] = None
     
-    def _categorize_market(self, market: Market, markets: Markets):
-        """Categorize market into appropriate list"""
-        market_type = market.type
+    def _parse_matches(self) -> List[Match]:
+        """Parse raw API response into structured matches"""
+        return _parse_chunk(self.raw_data.get("Value", []))
+    
+    def _build_indexes(self):
+        """Index parsed matches so lookups and filters avoid full scans"""
+        self._by_id: Dict[int, Match] = {}
+        self._by_sport: Dict[str, List[Match]] = defaultdict(list)
+        self._live: List[Match] = []
+        self.rows: List[MatchRow] = []
         
-        if market_type == 1:  # 1X2
-            markets.match_result.append(market)
-        elif market_type in [15, 62]:  # Over/Under
-            markets.over_under.append(market)
-        elif market_type in [2, 17]:  # Handicap
-            markets.handicap.append(market)
-        elif market_type == 19:  # Both teams to score
-            markets.both_teams_score.append(market)
-        elif market_type == 8:  # Correct score
-            markets.correct_score.append(market)
-    
-    def _parse_weather(self, weather_data: List[Dict]) -> Optional[Weather]:
-        """Parse weather information"""
-        if not weather_data:
-            return None
+        for match in self.matches:
+            row = _build_row(match)
+            self.rows.append(row)
+            self._by_id[match.id] = match
+            self._by_sport[row.sport_key].append(match)
+            if match.is_live:
+                self._live.append(match)
         
-        weather_map = {}
-        for item in weather_data:
-            key = item.get("K")
-            value = item.get("V")
-            
-            if key == 9:
-                weather_map["temperature"] = value
-            elif key == 21:
-                weather_map["condition"] = value
-            elif key == 27:
-                weather_map["humidity"] = value
-            elif key == 23:
-                weather_map["wind_speed"] = value
-            elif key == 25:
-                weather_map["pressure"] = value
-            elif key == 35:
-                weather_map["precipitation"] = value
+        # Columnar arrays of the rows (same order) for vectorized filtering
+        sports = pd.Categorical([row.sport_key for row in self.rows])
+        self._sport_code_by_key = {key: code for code, key in enumerate(sports.categories)}
+        self._sport_codes = np.asarray(sports.codes)
+        self._is_live = np.fromiter((row.is_live for row in self.rows), dtype=bool, count=len(self.rows))
+        self._max_odds = np.array(
+            [np.nan if row.max_odds is None else row.max_odds for row in self.rows],
+            dtype=np.float64
+        )
         
-        return Weather(**weather_map) if weather_map else None
+        self._league_counts = Counter(match.league for match in self.matches)
+        self._popular_leagues = [
+            {"league": league, "count": count}
+            for league, count in self._league_counts.most_common()
+        ]
+    
+    def get_match_by_id(self, match_id: int) -> Optional[Match]:
+        """Get a single match by ID"""
+        return self._by_id.get(match_id)
+    
+    def get_matches_by_sport(self, sport: str) -> List[Match]:
+        """Get matches for a sport (case-insensitive)"""
+        return self._by_sport.get(sport.lower(), [])
     
     def get_football_matches(self) -> List[Match]:
         """Get only football matches"""
-        return [m for m in self.matches if m.sport.lower() == "football"]
+        return self.get_matches_by_sport("football")
     
     def get_cricket_matches(self) -> List[Match]:
         """Get only cricket matches"""
-        return [m for m in self.matches if m.sport.lower() == "cricket"]
+        return self.get_matches_by_sport("cricket")
     
     def get_live_matches(self) -> List[Match]:
         """Get only live matches"""
-        return [m for m in self.matches if m.is_live]
+        return self._live
     
     def get_matches_with_good_odds(self, min_odds: float = 2.0) -> List[Match]:
         """Get matches with odds above threshold"""
         return [
-            m for m in self.matches 
-            if any(market.odds >= min_odds for market in m.markets.match_result)
+            row.match for row in self.rows
+            if row.max_odds is not None and row.max_odds >= min_odds
         ]
     
+    def filter_matches(
+        self,
+        sport: Optional[str] = None,
+        live_only: bool = False,
+        min_odds: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Match]:
+        """Get up to limit matches by sport, live status and minimum 1X2 odds"""
+        if not (live_only or min_odds):
+            # Plain sport filters are served straight from the prebuilt index
+            matches = self.get_matches_by_sport(sport) if sport else self.matches
+            return matches[:limit]
+        
+        mask = np.ones(len(self.rows), dtype=bool)
+        
+        if sport:
+            # Compare integer category codes; an unknown sport matches nothing
+            code = self._sport_code_by_key.get(sport.lower())
+            if code is None:
+                return []
+            mask &= self._sport_codes == code
+        
+        if live_only:
+            mask &= self._is_live
+        
+        if min_odds:
+            # NaN (no 1X2 market) never passes the comparison
+            mask &= self._max_odds >= min_odds
+        
+        # Only the returned page is materialized
+        return [self.rows[i].match for i in np.flatnonzero(mask)[:limit]]
+    
     def get_popular_leagues(self) -> List[Dict[str, Any]]:
         """Get leagues sorted by match count"""
-        league_counts = {}
-        for match in self.matches:
-            league_counts[match.league] = league_counts.get(match.league, 0) + 1
-        
-        return [
-            {"league": league, "count": count}
-            for league, count in sorted(league_counts.items(), key=lambda x: x[1], reverse=True)
-        ]
+        return self._popular_leagues
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert parsed data to dictionary"""
@@ -201,6 +305,12 @@ class BettingDataParser:
             "football_matches": len(self.get_football_matches()),
             "cricket_matches": len(self.get_cricket_matches()),
             "live_matches": len(self.get_live_matches()),
-            "matches": [match.model_dump() for match in self.matches],
+            "matches": MATCH_LIST_ADAPTER.dump_python(self.matches),
             "popular_leagues": self.get_popular_leagues()
-        }
\ No newline at end of file
+        }
+    
+    def to_json(self) -> bytes:
+        """Indented JSON of to_dict(), encoded once per parsed dataset"""
+        if self._json_export is None:
+            self._json_export = json_utils.dumps(self.to_dict(), indent=True)
+        return self._json_export
\ No newline at end of file
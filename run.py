@@ -63,10 +63,11 @@ def analyze_sample_data():
     
     try:
         from app.parser import BettingDataParser
+        from app import json_utils
         
         # Load sample data
-        with open("data/sample_data.json", 'r', encoding="utf-8") as f:
-            data = json.load(f)
+        with open("data/sample_data.json", 'rb') as f:
+            data = json_utils.loads(f.read())
         
         # Parse data
         parser = BettingDataParser(data)
@@ -99,9 +100,10 @@ def analyze_sample_data():
         import pandas as pd
         matches_data = []
         for match in parser.matches:
-            home_odds = next((m.odds for m in match.markets.match_result if m.outcome == 1), None)
-            draw_odds = next((m.odds for m in match.markets.match_result if m.outcome == 2), None)
-            away_odds = next((m.odds for m in match.markets.match_result if m.outcome == 3), None)
+            odds = match.markets.match_result_odds()
+            home_odds = odds.get(1)
+            draw_odds = odds.get(2)
+            away_odds = odds.get(3)
             
             matches_data.append({
                 "Match": match.name,